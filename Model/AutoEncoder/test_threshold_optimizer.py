@@ -0,0 +1,43 @@
+import warnings
+
+import numpy as np
+import pytest
+from sklearn.metrics import precision_recall_curve, roc_curve
+
+from threshold_optimizer import ThresholdOptimizer
+
+_rng = np.random.default_rng(0)
+
+CASES = {
+    "distinct": ([0, 1, 0, 1, 1, 0, 0, 1], [0.1, 0.9, 0.3, 0.7, 0.8, 0.2, 0.4, 0.6]),
+    "ties": ([0, 1, 1, 0, 1, 0, 0, 1, 0], [0.5, 0.5, 0.9, 0.2, 0.2, 0.5, 0.9, 0.1, 0.1]),
+    "rounded_random": (_rng.integers(0, 2, 200), np.round(_rng.random(200), 1)),
+    "all_negative": ([0, 0, 0, 0], [0.3, 0.1, 0.3, 0.7]),
+    "all_positive": ([1, 1, 1, 1], [0.3, 0.1, 0.3, 0.7]),
+}
+
+
+def _assert_curves_equal(ours, theirs):
+    assert len(ours) == len(theirs)
+    for got, expected in zip(ours, theirs):
+        np.testing.assert_array_equal(got, expected)
+
+
+@pytest.mark.parametrize("y_true, scores", CASES.values(), ids=CASES.keys())
+def test_pr_curve_matches_sklearn(y_true, scores):
+    optimizer = ThresholdOptimizer(y_true, scores)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = precision_recall_curve(y_true, scores)
+
+    _assert_curves_equal(optimizer._pr_curve, expected)
+
+
+@pytest.mark.parametrize("y_true, scores", CASES.values(), ids=CASES.keys())
+def test_roc_curve_matches_sklearn(y_true, scores):
+    optimizer = ThresholdOptimizer(y_true, scores)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = roc_curve(y_true, scores)
+
+    _assert_curves_equal(optimizer._roc_curve, expected)
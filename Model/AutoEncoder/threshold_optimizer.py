@@ -3,14 +3,15 @@ Advanced Threshold Optimization for Anomaly Detection
 Implements multiple strategies to find optimal threshold for reducing false positives
 """
 
+from functools import cached_property
+
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.metrics import (
     precision_score, recall_score, f1_score,
-    precision_recall_curve, roc_curve, auc,
-    confusion_matrix
+    auc, confusion_matrix
 )
 
 
@@ -26,19 +27,65 @@ class ThresholdOptimizer:
             y_true: Ground truth labels (0=benign, 1=malicious)
             anomaly_scores: Anomaly scores (e.g., reconstruction errors)
         """
-        self.y_true = y_true
-        self.anomaly_scores = anomaly_scores
+        self.y_true = np.asarray(y_true)
+        self.anomaly_scores = np.asarray(anomaly_scores)
         self.results = {}
 
+    @cached_property
+    def _clf_curve(self):
+        """
+        Cumulative FP/TP counts at each distinct score, highest score first.
+        One sort shared by the PR and ROC curves (same semantics as sklearn's
+        internal _binary_clf_curve).
+        """
+        order = np.argsort(-self.anomaly_scores, kind='stable')
+        scores = self.anomaly_scores[order]
+        y_sorted = (self.y_true[order] == 1).astype(np.int64)
+
+        # Last index of each run of tied scores, plus the final element
+        distinct_idx = np.where(np.diff(scores) != 0)[0]
+        threshold_idx = np.r_[distinct_idx, y_sorted.size - 1]
+
+        tps = np.cumsum(y_sorted)[threshold_idx]
+        fps = 1 + threshold_idx - tps
+        return fps, tps, scores[threshold_idx]
+
+    @cached_property
+    def _pr_curve(self):
+        """(precision, recall, thresholds) matching sklearn's precision_recall_curve."""
+        fps, tps, thresholds = self._clf_curve
+        predicted_pos = tps + fps
+        precision = np.divide(tps, predicted_pos, out=np.zeros(tps.shape), where=predicted_pos != 0)
+        recall = np.ones(tps.shape) if tps[-1] == 0 else tps / tps[-1]
+        # sklearn orders by increasing threshold and appends the (precision=1, recall=0) point
+        return (
+            np.r_[precision[::-1], 1.0],
+            np.r_[recall[::-1], 0.0],
+            thresholds[::-1],
+        )
+
+    @cached_property
+    def _roc_curve(self):
+        """(fpr, tpr, thresholds) matching sklearn's roc_curve (drop_intermediate=True)."""
+        fps, tps, thresholds = self._clf_curve
+        if len(fps) > 2:
+            # Drop thresholds that are collinear with their neighbours
+            keep = np.where(np.r_[True, np.logical_or(np.diff(fps, 2), np.diff(tps, 2)), True])[0]
+            fps, tps, thresholds = fps[keep], tps[keep], thresholds[keep]
+        fps = np.r_[0, fps]
+        tps = np.r_[0, tps]
+        thresholds = np.r_[np.inf, thresholds]
+        fpr = fps / fps[-1] if fps[-1] > 0 else np.full(fps.shape, np.nan)
+        tpr = tps / tps[-1] if tps[-1] > 0 else np.full(tps.shape, np.nan)
+        return fpr, tpr, thresholds
+
     def optimize_f1(self):
         """Find threshold that maximizes F1 score."""
         print("\n1. F1-Score Maximization")
         print("-" * 50)
 
         # Get precision-recall curve
-        precision, recall, thresholds = precision_recall_curve(
-            self.y_true, self.anomaly_scores
-        )
+        precision, recall, thresholds = self._pr_curve
 
         # Calculate F1 for each threshold
         f1_scores = 2 * (precision * recall) / (precision + recall + 1e-10)
@@ -67,9 +114,7 @@ class ThresholdOptimizer:
         print(f"\n2. Target Precision Optimization (Target: {target_precision:.0%})")
         print("-" * 50)
 
-        precision, recall, thresholds = precision_recall_curve(
-            self.y_true, self.anomaly_scores
-        )
+        precision, recall, thresholds = self._pr_curve
 
         # Find thresholds that meet target precision
         valid_idx = np.where(precision >= target_precision)[0]
@@ -85,15 +130,18 @@ class ThresholdOptimizer:
 
         best_threshold = thresholds[best_idx] if best_idx < len(thresholds) else thresholds[-1]
 
+        best_f1 = 2 * precision[best_idx] * recall[best_idx] / (precision[best_idx] + recall[best_idx] + 1e-10)
+
         print(f"  Optimal threshold: {best_threshold:.6f}")
         print(f"  Precision: {precision[best_idx]:.4f}")
         print(f"  Recall: {recall[best_idx]:.4f}")
-        print(f"  F1 Score: {2 * precision[best_idx] * recall[best_idx] / (precision[best_idx] + recall[best_idx]):.4f}")
+        print(f"  F1 Score: {best_f1:.4f}")
 
         self.results['precision_target'] = {
             'threshold': best_threshold,
             'precision': precision[best_idx],
             'recall': recall[best_idx],
+            'f1': best_f1,
             'target': target_precision
         }
 
@@ -104,9 +152,7 @@ class ThresholdOptimizer:
         print(f"\n3. Target Recall Optimization (Target: {target_recall:.0%})")
         print("-" * 50)
 
-        precision, recall, thresholds = precision_recall_curve(
-            self.y_true, self.anomaly_scores
-        )
+        precision, recall, thresholds = self._pr_curve
 
         # Find thresholds that meet target recall
         valid_idx = np.where(recall >= target_recall)[0]
@@ -121,15 +167,18 @@ class ThresholdOptimizer:
 
         best_threshold = thresholds[best_idx] if best_idx < len(thresholds) else thresholds[-1]
 
+        best_f1 = 2 * precision[best_idx] * recall[best_idx] / (precision[best_idx] + recall[best_idx] + 1e-10)
+
         print(f"  Optimal threshold: {best_threshold:.6f}")
         print(f"  Precision: {precision[best_idx]:.4f}")
         print(f"  Recall: {recall[best_idx]:.4f}")
-        print(f"  F1 Score: {2 * precision[best_idx] * recall[best_idx] / (precision[best_idx] + recall[best_idx]):.4f}")
+        print(f"  F1 Score: {best_f1:.4f}")
 
         self.results['recall_target'] = {
             'threshold': best_threshold,
             'precision': precision[best_idx],
             'recall': recall[best_idx],
+            'f1': best_f1,
             'target': target_recall
         }
 
@@ -140,7 +189,7 @@ class ThresholdOptimizer:
         print("\n4. Youden's J Statistic Optimization")
         print("-" * 50)
 
-        fpr, tpr, thresholds = roc_curve(self.y_true, self.anomaly_scores)
+        fpr, tpr, thresholds = self._roc_curve
 
         # Youden's J = TPR - FPR = Sensitivity + Specificity - 1
         j_scores = tpr - fpr
@@ -180,7 +229,7 @@ class ThresholdOptimizer:
         print("\n5. ROC Distance Optimization (Closest to Perfect)")
         print("-" * 50)
 
-        fpr, tpr, thresholds = roc_curve(self.y_true, self.anomaly_scores)
+        fpr, tpr, thresholds = self._roc_curve
 
         # Distance to perfect classifier (0, 1)
         distances = np.sqrt((1 - tpr)**2 + fpr**2)
@@ -353,12 +402,13 @@ class ThresholdOptimizer:
             cm = confusion_matrix(self.y_true, y_pred)
             tn, fp, fn, tp = cm.ravel()
 
+            # Every optimizer stores precision/recall/f1, so no re-scoring is needed here
             comparison_data.append({
                 'Method': method,
                 'Threshold': threshold,
-                'Precision': data.get('precision', precision_score(self.y_true, y_pred)),
-                'Recall': data.get('recall', recall_score(self.y_true, y_pred)),
-                'F1': data.get('f1', f1_score(self.y_true, y_pred)),
+                'Precision': data['precision'],
+                'Recall': data['recall'],
+                'F1': data['f1'],
                 'FP': fp,
                 'FN': fn,
                 'FPR': fp / (fp + tn)
@@ -402,9 +452,7 @@ class ThresholdOptimizer:
 
         # 1. Precision-Recall vs Threshold
         ax1 = fig.add_subplot(gs[0, :2])
-        precision, recall, thresholds_pr = precision_recall_curve(
-            self.y_true, self.anomaly_scores
-        )
+        precision, recall, thresholds_pr = self._pr_curve
         f1_scores = 2 * (precision * recall) / (precision + recall + 1e-10)
 
         # Align arrays
@@ -428,7 +476,7 @@ class ThresholdOptimizer:
 
         # 2. ROC Curve
         ax2 = fig.add_subplot(gs[0, 2])
-        fpr, tpr, _ = roc_curve(self.y_true, self.anomaly_scores)
+        fpr, tpr, _ = self._roc_curve
         roc_auc = auc(fpr, tpr)
 
         ax2.plot(fpr, tpr, linewidth=2, label=f'ROC (AUC={roc_auc:.3f})')
@@ -463,12 +511,7 @@ class ThresholdOptimizer:
         # 4. Method Comparison - F1 Scores
         ax4 = fig.add_subplot(gs[1, 2])
         methods = list(self.results.keys())
-        f1_values = []
-
-        for method in methods:
-            threshold = self.results[method]['threshold']
-            y_pred = (self.anomaly_scores >= threshold).astype(int)
-            f1_values.append(f1_score(self.y_true, y_pred))
+        f1_values = [self.results[m].get('f1', 0.0) for m in methods]
 
         colors = plt.cm.viridis(np.linspace(0, 1, len(methods)))
         ax4.barh(methods, f1_values, color=colors)
@@ -1,25 +1,40 @@
 import os
+import hashlib
+import threading
+import time
 import bcrypt
-from datetime import datetime, timedelta
+from cachetools import TTLCache
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from app.models.models import TokenData, User, UserInDB, PyObjectId
+from app.models.models import User, UserInDB, PyObjectId
 from app.database.connection import db
 from bson import ObjectId  # Import ObjectId from bson
 
 # JWT configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "f70331007dbc658b5ec33d99e19f8d2a9d12ba716413456b05f01669f11fba9d")
 ALGORITHM = "HS256"
+_ALGORITHMS = (ALGORITHM,)
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 3
 
+# bcrypt cost factor for new hashes (existing hashes keep the cost they were created with)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 # OAuth2 setup
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 # User collection
 users_collection = db.users
 
+# Successful bcrypt checks are remembered briefly so repeat logins skip the hashing cost.
+# Keys include the stored hash, so a password change (new salt) never matches old entries.
+# Failures are never cached.
+_verified_passwords = TTLCache(maxsize=10_000, ttl=300)
+_verified_passwords_lock = threading.Lock()
+
 # Password hashing utility functions
 def verify_password(plain_password, hashed_password):
     # Convert plain password to bytes
@@ -27,33 +42,81 @@ def verify_password(plain_password, hashed_password):
     # Convert hashed password from string to bytes if it's a string
     if isinstance(hashed_password, str):
         hashed_password = hashed_password.encode('utf-8')
+    cache_key = hashlib.sha256(password_bytes + b"|" + hashed_password).digest()
+    with _verified_passwords_lock:
+        if cache_key in _verified_passwords:
+            return True
     # Check password
-    return bcrypt.checkpw(password_bytes, hashed_password)
+    if not bcrypt.checkpw(password_bytes, hashed_password):
+        return False
+    with _verified_passwords_lock:
+        _verified_passwords[cache_key] = True
+    return True
 
 def get_password_hash(password):
     # Convert password to bytes
     password_bytes = password.encode('utf-8')
     # Generate salt
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS, prefix=b"2b")
     # Hash password
     hashed = bcrypt.hashpw(password_bytes, salt)
     # Return as string for storage
     return hashed.decode('utf-8')
 
 # User authentication functions
+# Only the fields User/UserInDB read; documents written by our own repo are trusted, so
+# lookups build the model with model_construct and skip re-validation (see _user_from_doc).
+_USER_PROJECTION = {
+    "email": 1,
+    "username": 1,
+    "disabled": 1,
+    "is_admin": 1,
+    "is_first_login": 1,
+    "hashed_password": 1,
+}
+
+def _user_from_doc(user_dict: dict) -> UserInDB:
+    """Build a UserInDB from a projected user document without re-validating it.
+    model_construct keeps values as-is, so fields Mongo stores in a different type
+    than the model declares are normalized here first."""
+    user_dict["_id"] = str(user_dict["_id"])
+    return UserInDB.model_construct(**user_dict)
+
 def get_user(username: str):
-    user_dict = users_collection.find_one({"username": {"$regex": f"^{username}$", "$options": "i"}})
+    # Case-insensitive match on the stored lowercase copy; exact match covers users not yet backfilled
+    user_dict = (
+        users_collection.find_one({"username_lower": username.lower()}, _USER_PROJECTION)
+        or users_collection.find_one({"username": username}, _USER_PROJECTION)
+    )
     if user_dict:
-        return UserInDB(**user_dict)
+        return _user_from_doc(user_dict)
     return None
 
+# Authenticated requests resolve the same user over and over; keep recent lookups for a minute.
+# user_repo calls invalidate_user() after every write to a user document.
+_users_by_id = TTLCache(maxsize=10_000, ttl=60)
+_users_by_id_lock = threading.Lock()
+
+def invalidate_user(user_id: str):
+    with _users_by_id_lock:
+        _users_by_id.pop(str(user_id), None)
+
 def get_user_by_id(user_id: str):
+    with _users_by_id_lock:
+        user = _users_by_id.get(user_id)
+    if user is not None:
+        return user
+    if not ObjectId.is_valid(user_id):
+        return None
     try:
         # Convert string ID to ObjectId
         object_id = ObjectId(user_id)
-        user_dict = users_collection.find_one({"_id": object_id})
+        user_dict = users_collection.find_one({"_id": object_id}, _USER_PROJECTION)
         if user_dict:
-            return UserInDB(**user_dict)
+            user = _user_from_doc(user_dict)
+            with _users_by_id_lock:
+                _users_by_id[user_id] = user
+            return user
     except Exception as e:
         print(f"Error retrieving user by ID: {e}")
     return None
@@ -68,15 +131,34 @@ def authenticate_user(username: str, password: str):
 
 # Token functions
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
     if expires_delta:
-        expire = datetime.now() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode = {**data, "exp": expire}
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Decoded token payloads, keyed by a digest of the raw token. Entries are dropped once the
+# token's own exp passes, even if the cache TTL hasn't.
+_token_payloads = TTLCache(maxsize=50_000, ttl=300)
+_token_payloads_lock = threading.Lock()
+
+def decode_access_token(token: str) -> dict:
+    cache_key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    with _token_payloads_lock:
+        payload = _token_payloads.get(cache_key)
+    if payload is not None:
+        exp = payload.get("exp")
+        if exp is None or exp > time.time():
+            return payload
+        with _token_payloads_lock:
+            _token_payloads.pop(cache_key, None)
+    payload = jwt.decode(token, _SECRET_KEY_BYTES, algorithms=_ALGORITHMS)
+    with _token_payloads_lock:
+        _token_payloads[cache_key] = payload
+    return payload
+
 def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -84,15 +166,15 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         user_id_str: str = payload.get("user_id")
         if user_id_str is None:
             raise credentials_exception
-        token_data = TokenData(user_id=user_id_str)
     except JWTError:
         raise credentials_exception
     
-    user = get_user_by_id(user_id=str(token_data.user_id))
+    # get_user_by_id rejects malformed ids itself, so the claim is passed through as-is
+    user = get_user_by_id(user_id=user_id_str)
     if user is None:
         raise credentials_exception
     return user
@@ -1,11 +1,23 @@
 # app/core/celery_app.py
 from celery import Celery
 import os
+import orjson
 import redis
 from dotenv import load_dotenv
+from kombu.serialization import register
 
 load_dotenv()
 
+# orjson-backed serializer for task and result payloads; plain json is still accepted.
+# OPT_NON_STR_KEYS matches the json serializer, which accepts int/float/bool/None dict keys.
+register(
+    'orjson',
+    lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+    orjson.loads,
+    content_type='application/x-orjson',
+    content_encoding='utf-8',
+)
+
 # Create Celery app with proper configuration
 celery_app = Celery(
     "starai_backend",
@@ -16,9 +28,9 @@ celery_app = Celery(
 
 # Configure Celery settings
 celery_app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    task_serializer='orjson',
+    accept_content=['orjson', 'json'],
+    result_serializer='orjson',
     timezone='UTC',
     enable_utc=True,
     task_track_started=True,
@@ -26,6 +38,8 @@ celery_app.conf.update(
     task_soft_time_limit=25 * 60,  # 25 minutes
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    broker_pool_limit=50,
+    broker_transport_options={'socket_keepalive': True, 'visibility_timeout': 3600},
 )
 
 # Redis connection
@@ -33,5 +47,14 @@ redis_host = os.getenv("REDIS_HOST", "localhost")
 redis_port = int(os.getenv("REDIS_PORT", "6379"))
 redis_db = int(os.getenv("REDIS_DB", "0"))
 
-r = redis.Redis(host=redis_host, port=redis_port, db=redis_db)
+# One bounded, health-checked pool shared by every user of `r`
+redis_pool = redis.ConnectionPool(
+    host=redis_host,
+    port=redis_port,
+    db=redis_db,
+    max_connections=64,
+    socket_keepalive=True,
+    health_check_interval=30,
+)
+r = redis.Redis(connection_pool=redis_pool)
 MAPPING_KEY = "starai_backend"
\ No newline at end of file
@@ -1,16 +1,33 @@
 import os
+import asyncio
 import boto3
+from boto3.s3.transfer import TransferConfig
 import botocore.config
 from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, BinaryIO, Dict, Any
-import traceback
 import logging
 import io
 from dotenv import load_dotenv
 
+# .env is read once here; refresh_credentials only re-reads os.environ
+load_dotenv()
+
 logger = logging.getLogger(__name__)
 
 class S3Manager:
+    # Default encryption for every upload; copied per call before adding type/metadata
+    DEFAULT_UPLOAD_EXTRA_ARGS = {'ServerSideEncryption': 'AES256'}
+
+    # Files above 8 MB move as parallel multipart uploads / ranged downloads in 8 MB parts
+    TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=10,
+        use_threads=True,
+    )
+
     def __init__(self):
         # Load from environment variables
         self.aws_access_key = os.environ.get("AWS_ACCESS_KEY_ID")
@@ -25,9 +42,14 @@ class S3Manager:
         self.s3_config = botocore.config.Config(
             signature_version='s3v4',
             s3={'addressing_style': 'virtual'},
+            # One pooled client is shared by every request/thread, so allow more than botocore's 10 sockets
+            max_pool_connections=64,
+            tcp_keepalive=True,
+            connect_timeout=2,
+            read_timeout=30,
             retries={
                 'max_attempts': 3,
-                'mode': 'standard'
+                'mode': 'adaptive'
             }
         )
         
@@ -49,14 +71,19 @@ class S3Manager:
         Refresh S3 credentials from environment variables
         """
         try:
-            # Reload environment variables
-            from dotenv import load_dotenv
-            load_dotenv()
-            
             # Get fresh credentials from environment
-            self.aws_access_key = os.environ.get("AWS_ACCESS_KEY_ID")
-            self.aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
-            self.region_name = os.environ.get("AWS_REGION", "ap-southeast-1")
+            aws_access_key = os.environ.get("AWS_ACCESS_KEY_ID")
+            aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+            region_name = os.environ.get("AWS_REGION", "ap-southeast-1")
+
+            # Keep the existing client (and its pooled connections) if nothing changed
+            if (aws_access_key, aws_secret_key, region_name) == (self.aws_access_key, self.aws_secret_key, self.region_name):
+                logger.info("S3Manager credentials unchanged, keeping existing client")
+                return True
+
+            self.aws_access_key = aws_access_key
+            self.aws_secret_key = aws_secret_key
+            self.region_name = region_name
             
             # Reinitialize the client with the new credentials
             self.s3_client = boto3.client(
@@ -94,13 +121,8 @@ class S3Manager:
                 if not self.aws_access_key or not self.aws_secret_key:
                     raise ValueError("Unable to obtain AWS credentials for S3 upload")
             
-            if not key.startswith(self.base_path):
-                full_key = f"{self.base_path}{key}"
-            else:
-                full_key = key
-
-            # Use the full key for upload
-            extra_args = {'ServerSideEncryption': 'AES256'}  # Default encryption
+            # Keys are stored as given: callers persist this exact key and read it back with get_object
+            extra_args = self.DEFAULT_UPLOAD_EXTRA_ARGS.copy()
             if content_type:
                 extra_args['ContentType'] = content_type
             if metadata:
@@ -114,7 +136,8 @@ class S3Manager:
                     file_obj,
                     self.bucket_name,
                     key,
-                    ExtraArgs=extra_args
+                    ExtraArgs=extra_args,
+                    Config=self.TRANSFER_CONFIG
                 )
             except ClientError as upload_error:
                 error_message = upload_error.response.get('Error', {}).get('Message', str(upload_error))
@@ -134,8 +157,7 @@ class S3Manager:
             logger.error(f"Error uploading file to S3: {e}")
             raise
         except Exception as e:
-            logger.error(f"Unexpected error during S3 upload: {str(e)}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception(f"Unexpected error during S3 upload: {str(e)}")
             raise
     
     def get_object(self, key: str) -> bytes:
@@ -166,7 +188,37 @@ class S3Manager:
             logger.error(f"Error getting object from S3: {e}")
             raise
     
-    def get_object_stream(self, key: str) -> io.BytesIO:
+    def download_fileobj(self, key: str, file_obj: BinaryIO) -> None:
+        """
+        Download an S3 object into a writable binary file-like object
+        
+        Args:
+            key: S3 object key
+            file_obj: Writable binary file-like object (e.g. open(path, 'wb'))
+            
+        Large objects are fetched as parallel ranged GETs and written part by part,
+        so memory use stays at the transfer chunk size rather than the object size.
+        """
+        try:
+            # Check if credentials are available
+            if not self.aws_access_key or not self.aws_secret_key:
+                logger.warning("S3 credentials missing, attempting to refresh...")
+                self.refresh_credentials()
+                if not self.aws_access_key or not self.aws_secret_key:
+                    raise ValueError("Unable to obtain AWS credentials for S3 upload")
+                
+            logger.info(f"Downloading object from S3: bucket={self.bucket_name}, key={key}")
+            self.s3_client.download_fileobj(
+                self.bucket_name,
+                key,
+                file_obj,
+                Config=self.TRANSFER_CONFIG
+            )
+        except ClientError as e:
+            logger.error(f"Error downloading object from S3: {e}")
+            raise
+    
+    def get_object_stream(self, key: str) -> StreamingBody:
         """
         Get an object from S3 as a file-like stream using Signature Version 4
         
@@ -174,7 +226,7 @@ class S3Manager:
             key: S3 object key
             
         Returns:
-            BytesIO object containing the file content
+            Streaming response body (read-only, not seekable); data is pulled from S3 as it is read
         """
         try:
             # Check if credentials are available
@@ -189,9 +241,7 @@ class S3Manager:
                 Bucket=self.bucket_name,
                 Key=key
             )
-            stream = io.BytesIO(response['Body'].read())
-            stream.seek(0)  # Reset the stream position to the beginning
-            return stream
+            return response['Body']
         except ClientError as e:
             logger.error(f"Error getting object stream from S3: {e}")
             raise
@@ -271,41 +321,47 @@ class S3Manager:
                     raise ValueError("Unable to obtain AWS credentials for S3 upload")
                 
             logger.info(f"Listing files in S3: bucket={self.bucket_name}, prefix={prefix}")
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
-            
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            objects = [
+                obj
+                for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+                for obj in page.get('Contents', [])
+            ]
+
+            def head_metadata(object_key: str) -> Dict[str, str]:
+                # Get object metadata to retrieve report metadata
+                try:
+                    head_response = self.s3_client.head_object(
+                        Bucket=self.bucket_name,
+                        Key=object_key
+                    )
+                    return head_response.get('Metadata', {})
+                except ClientError as e:
+                    logger.warning(f"Could not retrieve metadata for {object_key}: {e}")
+                    return {}
+
+            # HEAD requests are independent round-trips; overlap them instead of issuing them one by one
+            with ThreadPoolExecutor(max_workers=min(32, len(objects) or 1)) as executor:
+                metadata_list = list(executor.map(head_metadata, (obj['Key'] for obj in objects)))
+
             files = {}
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    # Remove the base path prefix from the key for cleaner display
-                    clean_key = obj['Key'].replace(prefix, '', 1) if obj['Key'].startswith(prefix) else obj['Key']
-                    
-                    # Get object metadata to retrieve report metadata
-                    try:
-                        head_response = self.s3_client.head_object(
-                            Bucket=self.bucket_name,
-                            Key=obj['Key']
-                        )
-                        object_metadata = head_response.get('Metadata', {})
-                    except ClientError as e:
-                        logger.warning(f"Could not retrieve metadata for {obj['Key']}: {e}")
-                        object_metadata = {}
-                    
-                    files[clean_key] = {
-                        'full_key': obj['Key'],  # Keep the full key for S3 operations
-                        'size': obj['Size'],
-                        'last_modified': obj['LastModified'].isoformat(),
-                        'storage_class': obj.get('StorageClass', 'STANDARD'),
-                        'report_metadata': {
-                            'report_type': object_metadata.get('report-type'),
-                            'primary_focus': object_metadata.get('primary-focus'),
-                            'template_name': object_metadata.get('template-name'),
-                            'created_by': object_metadata.get('created-by'),
-                            'sections_count': object_metadata.get('sections-count')
-                        }
+            for obj, object_metadata in zip(objects, metadata_list):
+                # Remove the base path prefix from the key for cleaner display
+                clean_key = obj['Key'].replace(prefix, '', 1) if obj['Key'].startswith(prefix) else obj['Key']
+
+                files[clean_key] = {
+                    'full_key': obj['Key'],  # Keep the full key for S3 operations
+                    'size': obj['Size'],
+                    'last_modified': obj['LastModified'].isoformat(),
+                    'storage_class': obj.get('StorageClass', 'STANDARD'),
+                    'report_metadata': {
+                        'report_type': object_metadata.get('report-type'),
+                        'primary_focus': object_metadata.get('primary-focus'),
+                        'template_name': object_metadata.get('template-name'),
+                        'created_by': object_metadata.get('created-by'),
+                        'sections_count': object_metadata.get('sections-count')
                     }
+                }
                     
             logger.info(f"Found {len(files)} files in S3")
             return files
@@ -423,7 +479,8 @@ async def upload_to_s3(file_content: bytes, s3_key: str, content_type: str) -> b
     """
     try:
         file_obj = io.BytesIO(file_content)
-        result = s3_manager.upload_file(file_obj, s3_key, content_type=content_type)
+        # upload_file blocks on the network; run it in a worker thread so the event loop keeps serving
+        result = await asyncio.to_thread(s3_manager.upload_file, file_obj, s3_key, content_type=content_type)
         # upload_file returns {"key": ..., "url": ..., "bucket": ...} on success
         return bool(result and result.get('url'))
     except Exception as e:
@@ -1,139 +1,100 @@
-from pymongo import MongoClient
-from pymongo.operations import SearchIndexModel
+from pymongo import AsyncMongoClient, MongoClient, IndexModel, UpdateOne
+from pymongo.errors import OperationFailure, PyMongoError
+from concurrent.futures import ThreadPoolExecutor
 
-import time
-import os
-from dotenv import load_dotenv
+from functools import lru_cache
 from datetime import timezone
-load_dotenv()
-
-# Determine environment
-ENV = os.getenv("APP_ENV")
-
-if ENV == "production":
-    PROJECT_VARIANT = os.getenv("PROJECT_VARIANT")
-    MONGO_URI = os.getenv("MONGO_SOF_DB_URI") if PROJECT_VARIANT == "sof" else os.getenv("MONGO_CASE_AND_CUSTOM_DB_URI")
-else:
-    # Local MongoDB connection (Docker)
-    MONGO_URI = "mongodb://mongodb:27017/?directConnection=true"
-
-# Global variables for lazy initialization
-_client = None
-_db = None
 
+from app.settings import settings
+
+# IndexOptionsConflict / IndexKeySpecsConflict: an equivalent index exists under another name or options
+INDEX_CONFLICT_CODES = (85, 86)
+
+# Dev workers restart on every reload, so don't prewarm sockets or hold idle ones long there
+_IS_DEV = settings.app_env == "development"
+
+# Options shared by the sync and async clients
+_CLIENT_OPTIONS = dict(
+    uuidRepresentation='standard', tz_aware=True, tzinfo=timezone.utc,
+    # Pool sized for concurrent request handlers plus background analysis tasks;
+    # MONGO_MAX_POOL / MONGO_MIN_POOL override the defaults per deployment
+    maxPoolSize=settings.mongo_max_pool,
+    minPoolSize=0 if _IS_DEV else settings.mongo_min_pool,
+    maxIdleTimeMS=30_000 if _IS_DEV else 300_000,
+    # Bound how long a request waits for a pooled socket before erroring out
+    waitQueueTimeoutMS=10_000,
+    # Fail fast when the server is unreachable instead of hanging requests for 30s
+    serverSelectionTimeoutMS=5000, connectTimeoutMS=3000, socketTimeoutMS=60000,
+    # Wire compression for the large anomaly/explanation/parsed-dataset documents.
+    # zstd is preferred (pymongo[zstd]); zlib ships with Python and is the fallback.
+    compressors='zstd,zlib', zlibCompressionLevel=-1,
+)
+
+# Clients are created on first call and memoized for the life of the process
+@lru_cache(maxsize=None)
 def get_client():
     """Get MongoDB client with lazy initialization"""
-    global _client
-    if _client is None:
-        _client = MongoClient(MONGO_URI, uuidRepresentation='standard', tz_aware=True,
-            tzinfo=timezone.utc)
-    return _client
+    return MongoClient(settings.mongo_uri, **_CLIENT_OPTIONS)
 
+@lru_cache(maxsize=None)
 def get_db():
     """Get database instance with lazy initialization"""
-    global _db
-    if _db is None:
-        _db = get_client().staraidocdb
-    return _db
-
-# Create properties that lazily initialize collections
-@property
-def client():
-    return get_client()
-
-@property 
-def db():
-    return get_db()
-
-@property
-def users_collection():
-    return get_db().users
-
-@property
-def datasets_collection():
-    return get_db().datasets
-
-@property
-def anomalies_collection():
-    return get_db().anomalies
-
-@property
-def anomaly_reports_collection():
-    return get_db().anomaly_reports
-
-@property
-def analysis_sessions_collection():
-    return get_db().analysis_sessions
-
-@property
-def llm_explanations_collection():
-    return get_db().llm_explanations
-
-# Create a module-level class to hold our lazy properties
-class DatabaseConnections:
-    @property
-    def client(self):
-        return get_client()
-
-    @property 
-    def db(self):
-        return get_db()
-
-    @property
-    def users_collection(self):
-        return get_db().users
-
-    @property
-    def datasets_collection(self):
-        return get_db().datasets
-
-    @property
-    def anomalies_collection(self):
-        return get_db().anomalies
-
-    @property
-    def anomaly_reports_collection(self):
-        return get_db().anomaly_reports
-
-    @property
-    def analysis_sessions_collection(self):
-        return get_db().analysis_sessions
-
-    @property
-    def llm_explanations_collection(self):
-        return get_db().llm_explanations
-
-# Create instance for module-level access
-_connections = DatabaseConnections()
-
-# Export collections for backward compatibility
-client = _connections.client
-db = _connections.db
-users_collection = _connections.users_collection
-datasets_collection = _connections.datasets_collection
-anomalies_collection = _connections.anomalies_collection
-anomaly_reports_collection = _connections.anomaly_reports_collection
-analysis_sessions_collection = _connections.analysis_sessions_collection
-llm_explanations_collection = _connections.llm_explanations_collection
+    return get_client().staraidocdb
+
+@lru_cache(maxsize=None)
+def get_async_client():
+    """Get the asyncio MongoDB client (for use inside async route/repository code)"""
+    return AsyncMongoClient(settings.mongo_uri, **_CLIENT_OPTIONS)
+
+@lru_cache(maxsize=None)
+def get_async_db():
+    """Get asyncio database instance with lazy initialization"""
+    return get_async_client().staraidocdb
+
+# Module-level names resolved on first access (PEP 562), so importing this module
+# doesn't construct a client. `from app.database.connection import db` still works.
+_COLLECTION_NAMES = {
+    "users_collection": "users",
+    "datasets_collection": "datasets",
+    "anomalies_collection": "anomalies",
+    "anomaly_reports_collection": "anomaly_reports",
+    "analysis_sessions_collection": "analysis_sessions",
+    "llm_explanations_collection": "llm_explanations",
+}
+
+def __getattr__(name):
+    if name == "client":
+        value = get_client()
+    elif name == "db":
+        value = get_db()
+    elif name in _COLLECTION_NAMES:
+        value = get_db()[_COLLECTION_NAMES[name]]
+    # async_users_collection, async_datasets_collection, ... for awaitable access
+    elif name.startswith("async_") and name[len("async_"):] in _COLLECTION_NAMES:
+        value = get_async_db()[_COLLECTION_NAMES[name[len("async_"):]]]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache as a real module global so later lookups never reach __getattr__ again
+    globals()[name] = value
+    return value
 
 def reset_database():
     """Drop all collections and reset the database"""
-    if ENV == "production":
+    if settings.app_env == "production":
         print("WARNING: Refusing to reset collections in production environment.")
         return False
     
     print("Dropping all collections...")
     
-    # Get all existing collection names
+    # One dropDatabase command instead of a drop round trip per collection
     db_instance = get_db()
-    collection_names = db_instance.list_collection_names()
-    
-    for collection_name in collection_names:
-        try:
-            db_instance[collection_name].drop()
-            print(f"Dropped collection: {collection_name}")
-        except Exception as e:
-            print(f"Error dropping collection {collection_name}: {str(e)}")
+    try:
+        collection_names = db_instance.list_collection_names()
+        db_instance.client.drop_database(db_instance.name)
+        print(f"Dropped collections: {', '.join(collection_names) or '(none)'}")
+    except PyMongoError as e:
+        print(f"Error dropping database {db_instance.name}: {str(e)}")
+        return False
     
     print("All collections dropped successfully.")
     return True
@@ -143,107 +104,164 @@ def create_indexes():
 
     # Get collections with lazy initialization
     db_instance = get_db()
-    users_coll = _connections.users_collection
-    datasets_coll = _connections.datasets_collection
-    anomalies_coll = _connections.anomalies_collection
-    anomaly_reports_coll = _connections.anomaly_reports_collection
-    sessions_coll = _connections.analysis_sessions_collection
-    llm_explanations_coll = _connections.llm_explanations_collection
-
-    def index_exists(collection, index_name):
-        """Check if an index already exists on a collection"""
+    users_coll = db_instance.users
+    datasets_coll = db_instance.datasets
+    anomalies_coll = db_instance.anomalies
+    anomaly_reports_coll = db_instance.anomaly_reports
+    sessions_coll = db_instance.analysis_sessions
+    llm_explanations_coll = db_instance.llm_explanations
+
+    def existing_index_names(collection):
+        """Names of the indexes already on a collection (one listIndexes round trip)"""
         try:
-            existing_indexes = list(collection.list_indexes())
-            return any(idx.get('name') == index_name for idx in existing_indexes)
-        except Exception as e:
+            return {idx.get('name') for idx in collection.list_indexes()}
+        except PyMongoError as e:
             print(f"Error checking if index exists: {str(e)}")
-            return False
-
-    def create_index_if_not_exists(collection, keys, index_name=None, **kwargs):
-        """Create an index if it doesn't already exist"""
-        if index_name and index_exists(collection, index_name):
-            print(f"Index '{index_name}' already exists on collection {collection.name}")
+            return set()
+
+    def ensure_indexes(collection, index_models):
+        """Create the indexes that don't exist yet with a single createIndexes command"""
+        existing = existing_index_names(collection)
+        missing = []
+        for model in index_models:
+            index_name = model.document["name"]
+            if index_name in existing:
+                print(f"Index '{index_name}' already exists on collection {collection.name}")
+            else:
+                missing.append(model)
+        if not missing:
             return
 
-        # For compound indexes without explicit name
-        if not index_name and isinstance(keys, list):
-            # Generate a name for compound indexes to check
-            field_parts = [f"{k[0]}_{k[1]}" for k in keys]
-            generated_name = "_".join(field_parts)
-            if index_exists(collection, generated_name):
-                print(f"Compound index '{generated_name}' already exists on collection {collection.name}")
-                return
+        try:
+            collection.create_indexes(missing)
+            print(f"Created indexes {[m.document['name'] for m in missing]} on collection {collection.name}")
+        except PyMongoError as e:
+            # One bad index fails the whole batch; retry individually so the rest still get built
+            print(f"Error creating indexes on collection {collection.name}: {str(e)}; retrying one by one")
+            for model in missing:
+                index_name = model.document["name"]
+                try:
+                    collection.create_indexes([model])
+                    print(f"Created index {index_name} on collection {collection.name}")
+                except PyMongoError as e:
+                    if isinstance(e, OperationFailure) and e.code in INDEX_CONFLICT_CODES:
+                        print(f"Index {index_name} on collection {collection.name} conflicts with an existing index: {str(e)}")
+                    else:
+                        print(f"Error creating index {index_name} on collection {collection.name}: {str(e)}")
+
+    index_plan = [
+        # ============= USER MANAGEMENT INDEXES =============
+        (users_coll, [
+            IndexModel("username", name="username_1", unique=True),
+            # Sparse so users not yet backfilled (no username_lower) don't collide on null
+            IndexModel("username_lower", name="username_lower_1", unique=True, sparse=True),
+            IndexModel("email", name="email_1", unique=True),
+        ]),
+
+        # ============= ANOMALY DETECTION INDEXES =============
+
+        # Dataset indexes
+        (datasets_coll, [
+            IndexModel("user_id", name="user_id_1"),
+            IndexModel("status", name="status_1"),
+            IndexModel("uploaded_at", name="uploaded_at_1"),
+            IndexModel([("user_id", 1), ("filename", 1)], name="user_id_1_filename_1"),
+        ]),
+
+        # Anomalies indexes
+        (anomalies_coll, [
+            IndexModel("dataset_id", name="dataset_id_1"),
+            IndexModel("user_id", name="user_id_1"),
+            IndexModel("status", name="status_1"),
+            IndexModel("anomaly_score", name="anomaly_score_1"),
+            IndexModel("detected_at", name="detected_at_1"),
+            IndexModel([("dataset_id", 1), ("row_index", 1)], name="dataset_id_1_row_index_1"),
+        ]),
+
+        # Anomaly reports indexes
+        (anomaly_reports_coll, [
+            IndexModel("user_id", name="user_id_1"),
+            IndexModel("dataset_id", name="dataset_id_1"),
+            IndexModel("anomaly_id", name="anomaly_id_1", unique=True),
+            IndexModel("status", name="status_1"),
+            IndexModel("created_at", name="created_at_1"),
+            IndexModel([("user_id", 1), ("status", 1)], name="user_id_1_status_1"),
+        ]),
+
+        # Analysis sessions indexes
+        (sessions_coll, [
+            IndexModel("user_id", name="user_id_1"),
+            IndexModel("dataset_id", name="dataset_id_1", unique=True),
+            IndexModel("status", name="status_1"),
+            IndexModel("started_at", name="started_at_1"),
+        ]),
+
+        # LLM explanations indexes
+        (llm_explanations_coll, [
+            IndexModel("dataset_id", name="dataset_id_1"),
+            IndexModel("anomaly_id", name="anomaly_id_1", unique=True),
+            IndexModel("session_id", name="session_id_1"),
+            IndexModel("verdict", name="verdict_1"),
+            IndexModel("severity", name="severity_1"),
+            IndexModel("status", name="status_1"),
+            IndexModel("created_at", name="created_at_1"),
+        ]),
+    ]
+
+    # username_lower_1 is built below, so existing users need the field first
+    backfill_username_lower(users_coll)
+
+    # Collections are independent, so overlap their (blocking) index round trips
+    with ThreadPoolExecutor(max_workers=len(index_plan)) as executor:
+        list(executor.map(lambda plan: ensure_indexes(*plan), index_plan))
+
+    print("All anomaly detection indexes created successfully.")
+
+
+def backfill_username_lower(users_coll):
+    """Store the lowercased username on users created before username_lower existed.
+    Usernames are matched case-insensitively through this field; DocumentDB has no collation support."""
+    try:
+        updates = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": {"username_lower": doc["username"].lower()}})
+            for doc in users_coll.find(
+                {"username_lower": {"$exists": False}, "username": {"$type": "string"}},
+                projection={"username": 1},
+            )
+        ]
+        if updates:
+            users_coll.bulk_write(updates, ordered=False)
+            print(f"Backfilled username_lower on {len(updates)} users")
+    except PyMongoError as e:
+        print(f"Error backfilling username_lower: {str(e)}")
+
+
+def ensure_dev_admin():
+    """Create the default admin user in development if it doesn't exist yet"""
+    if settings.app_env != "development":
+        return
+
+    # Imported here so index creation / reset don't pull in the auth stack
+    from app.core.auth import get_password_hash
+
+    users_coll = get_db().users
+
+    # Check if admin user already exists
+    existing_admin = users_coll.find_one({"username_lower": "admin"}, projection={"_id": 1})
+
+    if not existing_admin:
+        # Create admin user
+        admin_user = {
+            "email": "admin@example.com",
+            "username": "admin",
+            "username_lower": "admin",
+            "disabled": False,
+            "hashed_password": get_password_hash("password123"),
+            "is_admin": True
+        }
 
         try:
-            collection.create_index(keys, name=index_name, **kwargs)
-            print(f"Created index {index_name or keys} on collection {collection.name}")
-        except Exception as e:
-            print(f"Error creating index {index_name or keys} on collection {collection.name}: {str(e)}")
-
-    # ============= USER MANAGEMENT INDEXES =============
-    create_index_if_not_exists(users_coll, "username", "username_1", unique=True)
-    create_index_if_not_exists(users_coll, "email", "email_1", unique=True)
-
-    # ============= ANOMALY DETECTION INDEXES =============
-
-    # Dataset indexes
-    create_index_if_not_exists(datasets_coll, "user_id", "user_id_1")
-    create_index_if_not_exists(datasets_coll, "status", "status_1")
-    create_index_if_not_exists(datasets_coll, "uploaded_at", "uploaded_at_1")
-    create_index_if_not_exists(datasets_coll, [("user_id", 1), ("filename", 1)], "user_id_1_filename_1")
-
-    # Anomalies indexes
-    create_index_if_not_exists(anomalies_coll, "dataset_id", "dataset_id_1")
-    create_index_if_not_exists(anomalies_coll, "user_id", "user_id_1")
-    create_index_if_not_exists(anomalies_coll, "status", "status_1")
-    create_index_if_not_exists(anomalies_coll, "anomaly_score", "anomaly_score_1")
-    create_index_if_not_exists(anomalies_coll, "detected_at", "detected_at_1")
-    create_index_if_not_exists(anomalies_coll, [("dataset_id", 1), ("row_index", 1)], "dataset_id_1_row_index_1")
-
-    # Anomaly reports indexes
-    create_index_if_not_exists(anomaly_reports_coll, "user_id", "user_id_1")
-    create_index_if_not_exists(anomaly_reports_coll, "dataset_id", "dataset_id_1")
-    create_index_if_not_exists(anomaly_reports_coll, "anomaly_id", "anomaly_id_1", unique=True)
-    create_index_if_not_exists(anomaly_reports_coll, "status", "status_1")
-    create_index_if_not_exists(anomaly_reports_coll, "created_at", "created_at_1")
-    create_index_if_not_exists(anomaly_reports_coll, [("user_id", 1), ("status", 1)], "user_id_1_status_1")
-
-    # Analysis sessions indexes
-    create_index_if_not_exists(sessions_coll, "user_id", "user_id_1")
-    create_index_if_not_exists(sessions_coll, "dataset_id", "dataset_id_1", unique=True)
-    create_index_if_not_exists(sessions_coll, "status", "status_1")
-    create_index_if_not_exists(sessions_coll, "started_at", "started_at_1")
-
-    # LLM explanations indexes
-    create_index_if_not_exists(llm_explanations_coll, "dataset_id", "dataset_id_1")
-    create_index_if_not_exists(llm_explanations_coll, "anomaly_id", "anomaly_id_1", unique=True)
-    create_index_if_not_exists(llm_explanations_coll, "session_id", "session_id_1")
-    create_index_if_not_exists(llm_explanations_coll, "verdict", "verdict_1")
-    create_index_if_not_exists(llm_explanations_coll, "severity", "severity_1")
-    create_index_if_not_exists(llm_explanations_coll, "status", "status_1")
-    create_index_if_not_exists(llm_explanations_coll, "created_at", "created_at_1")
-
-    # Create admin user in development environment
-    if ENV == "development" or ENV is None:
-        from app.core.auth import get_password_hash
-
-        # Check if admin user already exists
-        existing_admin = users_coll.find_one({"username": "admin"})
-
-        if not existing_admin:
-            # Create admin user
-            admin_user = {
-                "email": "admin@example.com",
-                "username": "admin",
-                "disabled": False,
-                "hashed_password": get_password_hash("password123"),
-                "is_admin": True
-            }
-
-            try:
-                users_coll.insert_one(admin_user)
-                print("Development admin user created successfully")
-            except Exception as e:
-                print(f"Warning: Failed to create admin user: {e}")
-
-    print("All anomaly detection indexes created successfully.")
\ No newline at end of file
+            users_coll.insert_one(admin_user)
+            print("Development admin user created successfully")
+        except PyMongoError as e:
+            print(f"Warning: Failed to create admin user: {e}")
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from core.s3_manager import s3_manager
 
@@ -18,20 +19,24 @@ def download_all_files(local_dir: str, prefix: str = ""):
         print("No files found in the bucket.")
         return
 
-    for file_name, file_info in all_files.items():
+    def _fetch(item):
+        file_name, file_info = item
         s3_key = file_info['full_key']
         local_path = os.path.join(local_dir, file_name)
 
         # Ensure local folder exists
         os.makedirs(os.path.dirname(local_path), exist_ok=True)
 
-        # Download the file directly
-        file_content = s3_manager.get_object(s3_key)
+        # Stream the object straight to disk instead of holding it in memory
         with open(local_path, "wb") as f:
-            f.write(file_content)
+            s3_manager.download_fileobj(s3_key, f)
 
         print(f"Downloaded: {s3_key} → {local_path}")
 
+    # Each GET is latency-bound, so keep several downloads in flight (S3_PARALLEL overrides)
+    with ThreadPoolExecutor(max_workers=int(os.getenv("S3_PARALLEL", "16"))) as executor:
+        list(executor.map(_fetch, all_files.items()))
+
     print(f"\nSuccessfully downloaded {len(all_files)} files to '{local_dir}'.")
 
 
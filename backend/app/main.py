@@ -1,9 +1,11 @@
 # main.py
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, FileResponse
+from contextlib import asynccontextmanager
+import asyncio
 import logging
 import sys
 import os
@@ -16,25 +18,32 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 from app.routes import user_routes, anomaly_routes
-from app.database.connection import create_indexes, reset_database
+from app.database.connection import create_indexes, ensure_dev_admin, reset_database
 
-# Initialize FastAPI app
-from dotenv import load_dotenv
-load_dotenv()
+from app.settings import settings
+
+
+def init_database():
+    # Runs in a background task, so log failures here rather than at shutdown when the task is awaited
+    try:
+        # reset_database()
+        create_indexes()
+        ensure_dev_admin()
+        print("Startup: DB indexes initialized.")
+    except Exception:
+        logger.exception("Startup: DB initialization failed")
 
-# Set ROOT_URL_BACKEND based on PROJECT_VARIANT
-PROJECT_VARIANT = os.environ.get('PROJECT_VARIANT')
-if PROJECT_VARIANT == 'sof':
-    ROOT_URL_BACKEND = os.environ.get('SOF_URL', '')
-elif PROJECT_VARIANT == 'report':
-    ROOT_URL_BACKEND = os.environ.get('REPORT_URL', '')
-elif PROJECT_VARIANT == 'custom':
-    ROOT_URL_BACKEND = os.environ.get('CUSTOM_URL', '')
-else:
-    ROOT_URL_BACKEND = ""
 
-APP_ENV = os.environ.get('APP_ENV')
-app = FastAPI(root_path=ROOT_URL_BACKEND)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build indexes on a worker thread so the server starts accepting requests immediately
+    init_task = asyncio.create_task(asyncio.to_thread(init_database))
+    yield
+    await init_task
+
+
+# Initialize FastAPI app
+app = FastAPI(root_path=settings.root_url_backend, lifespan=lifespan)
 
 
 # CORS settings
@@ -46,12 +55,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
-def startup_event():
-    # reset_database()
-    create_indexes()
-    print("Startup event: Upload directories and DB indexes initialized.")
-
 # --- API ROUTERS ---
 
 # Authentication and User Routes
@@ -63,37 +66,47 @@ app.include_router(user_routes.admin_router, prefix="/api", tags=["Admin"])
 # Anomaly Detection Routes (Main System)
 app.include_router(anomaly_routes.router, prefix="/api/anomaly", tags=["Anomaly Detection"])
 
-if APP_ENV == "production" or APP_ENV == "test":
+if settings.app_env in ("production", "test"):
     # Serve React static files
     frontend_build_path = "/app/frontend/dist"  # Direct path in container
     if os.path.exists(frontend_build_path):
+        # Resolve the root static file paths once instead of per request
+        INDEX_HTML = os.path.join(frontend_build_path, "index.html")
+        FAVICON = os.path.join(frontend_build_path, "favicon.ico")
+        MANIFEST = os.path.join(frontend_build_path, "manifest.json")
+        ROBOTS = os.path.join(frontend_build_path, "robots.txt")
+        ROOT_STATIC_FILES = frozenset(["favicon.ico", "manifest.json", "robots.txt"])
+        NON_SPA_PREFIXES = ("api/", "assets/", "temp-audio/")
+
         # Mount static assets
         app.mount("/assets", StaticFiles(directory=os.path.join(frontend_build_path, "assets")), name="assets")
 
         # Specific routes for root static files
         @app.get("/favicon.ico")
         async def favicon():
-            return FileResponse(os.path.join(frontend_build_path, "favicon.ico"))
+            return FileResponse(FAVICON)
 
         @app.get("/manifest.json")
         async def manifest():
-            return FileResponse(os.path.join(frontend_build_path, "manifest.json"))
+            return FileResponse(MANIFEST)
 
         @app.get("/robots.txt")
         async def robots():
-            return FileResponse(os.path.join(frontend_build_path, "robots.txt"))
+            return FileResponse(ROBOTS)
 
-    if os.path.exists(frontend_build_path):
-        # Catch-all route for React Router - must be last
+        # Catch-all route for React Router - must be last.
+        # (StaticFiles(html=True) only serves index.html for directories, not unknown
+        # client-side routes, so it can't replace this SPA fallback.)
         @app.get("/{full_path:path}")
         async def serve_react_app(full_path: str):
             # Skip API routes and static files - let FastAPI handle 404s
-            if full_path.startswith("api/") or full_path.startswith("assets/") or full_path.startswith("temp-audio/") or full_path in ["favicon.ico", "manifest.json", "robots.txt"]:
-                from fastapi import HTTPException
+            if full_path.startswith(NON_SPA_PREFIXES) or full_path in ROOT_STATIC_FILES:
                 raise HTTPException(status_code=404, detail="Not found")
             
             # Serve React index.html for all other routes
-            return FileResponse(os.path.join(frontend_build_path, "index.html"))
+            return FileResponse(INDEX_HTML)
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True, log_level="debug", ws="websockets")
\ No newline at end of file
+    # Auto-reload only while developing; uvicorn can only reload an app given as an import string
+    reload = settings.app_env == "development"
+    uvicorn.run("app.main:app" if reload else app, host="0.0.0.0", port=8000, reload=reload, log_level="debug", ws="websockets")
\ No newline at end of file
@@ -0,0 +1,143 @@
+# app/models/models.py
+
+import re
+from pydantic import BaseModel, BeforeValidator, ConfigDict, EmailStr, Field, PlainSerializer
+from bson import ObjectId
+from typing import Annotated, Any, Optional, List
+from datetime import datetime
+
+# A string is a valid ObjectId exactly when it is 24 hex characters
+_OID_RE = re.compile(r"^[0-9a-fA-F]{24}\Z").match
+
+# --- Pydantic v2 Compliant PyObjectId ---
+def validate_object_id(value: Any) -> str:
+    """Accept an ObjectId or its 24-hex string form; reject anything else"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, str) and _OID_RE(value):
+        return value
+    raise ValueError("Invalid ObjectId")
+
+
+# Flat str schema with one before-validator; ids are held and serialized as hex strings.
+# The serializer also covers instances built with model_construct, where the validator never ran.
+PyObjectId = Annotated[str, BeforeValidator(validate_object_id), PlainSerializer(str, return_type=str)]
+
+# Shared by the Mongo-backed models; defer_build postpones schema/validator construction
+# until a model is first used
+_COMMON_CONFIG = ConfigDict(
+    populate_by_name=True,
+    validate_assignment=True,
+    defer_build=True,
+)
+
+# ------------------------------------------------------User-related models------------------------------------------------------
+class UserCreate(BaseModel):
+    email: EmailStr
+    username: str
+    password: str
+
+class User(BaseModel):
+    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    email: EmailStr
+    username: str
+    disabled: bool = False
+    is_admin: bool = False
+    is_first_login: bool = False
+
+    model_config = _COMMON_CONFIG | {
+        "arbitrary_types_allowed": True,
+        "json_schema_extra": {
+            "example": {
+                "id": "60d725b4e24b5400f7d5e7c8",
+                "email": "user@example.com",
+                "username": "username",
+                "disabled": False,
+                "is_admin": False,
+                "is_first_login": False
+            }
+        },
+    }
+
+class PasswordUpdate(BaseModel):
+    new_password: str
+    confirm_password: str
+
+class UsernameUpdate(BaseModel):
+    new_username: str
+
+class UserInDB(User):
+    hashed_password: str
+
+class AdminUserUpdate(BaseModel):
+    username: Optional[str] = None
+    email: Optional[EmailStr] = None
+    password: Optional[str] = None
+    disabled: Optional[bool] = None
+    is_admin: Optional[bool] = None
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str
+
+class TokenData(BaseModel):
+    user_id: PyObjectId
+
+
+# ------------------------------------------------------Case/Document-related models------------------------------------------------------
+# Case model
+class Case(BaseModel):
+    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    user_id: PyObjectId
+    name: str
+
+    model_config = _COMMON_CONFIG | {
+        "json_schema_extra": {
+            "example": {
+                "id": "60d725b4e24b5400f7d5e7c8",
+                "user_id": "user123",
+                "name": "Case Name"
+            }
+        }
+    }
+
+class CaseCreate(BaseModel):
+    name: str
+
+# Document model - need to change when using agentic chunking
+class ChunkModel(BaseModel):
+    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    doc_id: PyObjectId
+    index: int
+    embedding: Optional[List[float]] = None
+    content: Optional[str] = None
+
+    model_config = _COMMON_CONFIG
+
+class DocumentModel(BaseModel):
+    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    case_id: PyObjectId
+    name: str
+    content: str
+    content_type: Optional[str] = None
+    s3_key: str # need this for generating presigned url
+    # Optional timestamps - older documents may not have these fields which is why
+    # they are optional. Stored as ISO8601 strings for easy parsing on frontend.
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    model_config = _COMMON_CONFIG | {
+        "json_schema_extra": {
+            "example": {
+                "id": "60d725b4e24b5400f7d5e7c8",
+                "case_id": "case123",
+                "name": "Document Name",
+                "content": "Document content...",
+                "content_type": "application/pdf",
+                "s3_key": "documents/file.pdf"
+                ,
+                "created_at": "2025-01-01T00:00:00Z",
+                "updated_at": "2025-01-01T00:00:00Z"
+            }
+        }
+    }
\ No newline at end of file
@@ -8,6 +8,7 @@ from typing import List, Optional
 from datetime import datetime, timezone
 from bson import ObjectId
 from fastapi import HTTPException
+import asyncio
 import logging
 
 from app.database.connection import (
@@ -17,10 +18,14 @@ from app.database.connection import (
     analysis_sessions_collection,
     llm_explanations_collection
 )
+# The async collections are read off the module at call time, so the AsyncMongoClient is
+# only created on first use rather than when this module is imported
+from app.database import connection
 from app.models.anomaly_models import (
     DatasetModel,
     DatasetStatus,
     DetectedAnomaly,
+    DetectedAnomalyList,
     AnomalyStatus,
     AnomalyReport,
     ReportStatus,
@@ -31,7 +36,8 @@ from app.models.anomaly_models import (
     AnomalyReportSummary,
     DatasetSummary,
     SeverityLevel,
-    LLMExplanation
+    LLMExplanation,
+    LLMExplanationList
 )
 from app.models.models import User
 
@@ -90,13 +96,13 @@ async def get_dataset(dataset_id: str, current_user: User) -> DatasetModel:
     if not is_admin:
         query["user_id"] = str(current_user.id)
 
-    dataset_doc = datasets_collection.find_one(query)
+    dataset_doc = await connection.async_datasets_collection.find_one(query)
 
     if not dataset_doc:
         logger.warning(f"Dataset {dataset_id} not found for user {current_user.id}")
         raise HTTPException(status_code=404, detail=f"Dataset not found or access denied")
 
-    return DatasetModel.model_validate(dataset_doc)
+    return DatasetModel.from_mongo(dataset_doc)
 
 
 async def get_user_datasets(
@@ -112,8 +118,8 @@ async def get_user_datasets(
         if status:
             query["status"] = status.value
 
-        cursor = datasets_collection.find(query).sort("uploaded_at", -1).limit(limit)
-        datasets = list(cursor)
+        cursor = connection.async_datasets_collection.find(query).sort("uploaded_at", -1).limit(limit)
+        datasets = await cursor.to_list(length=limit)
         logger.debug(f"Found {len(datasets)} datasets")
 
         # Build summaries with anomaly counts
@@ -123,7 +129,7 @@ async def get_user_datasets(
                 dataset_id = str(doc["_id"])
 
                 # Count anomalies for this dataset
-                anomaly_count = anomalies_collection.count_documents({"dataset_id": dataset_id})
+                anomaly_count = await connection.async_anomalies_collection.count_documents({"dataset_id": dataset_id})
 
                 summary = DatasetSummary(
                     id=dataset_id,
@@ -153,7 +159,7 @@ async def update_dataset(
     updates: dict
 ) -> DatasetModel:
     """Update dataset with arbitrary fields"""
-    datasets_collection.update_one(
+    await connection.async_datasets_collection.update_one(
         {"_id": ObjectId(dataset_id)},
         {"$set": updates}
     )
@@ -161,8 +167,8 @@ async def update_dataset(
     logger.info(f"Updated dataset {dataset_id} with fields: {list(updates.keys())}")
 
     # Return updated document
-    updated_doc = datasets_collection.find_one({"_id": ObjectId(dataset_id)})
-    return DatasetModel.model_validate(updated_doc)
+    updated_doc = await connection.async_datasets_collection.find_one({"_id": ObjectId(dataset_id)})
+    return DatasetModel.from_mongo(updated_doc)
 
 
 async def update_dataset_status(
@@ -194,7 +200,7 @@ async def update_dataset_status(
 
     # Return updated document
     updated_doc = datasets_collection.find_one({"_id": ObjectId(dataset_id)})
-    return DatasetModel.model_validate(updated_doc)
+    return DatasetModel.from_mongo(updated_doc)
 
 
 async def delete_dataset(dataset_id: str, current_user: User) -> bool:
@@ -205,7 +211,7 @@ async def delete_dataset(dataset_id: str, current_user: User) -> bool:
     # Delete S3 file
     try:
         from app.core.s3_manager import s3_manager
-        s3_manager.delete_file(dataset.s3_key)
+        await asyncio.to_thread(s3_manager.delete_file, dataset.s3_key)
         logger.info(f"Deleted S3 file: {dataset.s3_key}")
     except Exception as e:
         logger.error(f"Error deleting S3 file {dataset.s3_key}: {str(e)}")
@@ -244,7 +250,7 @@ async def delete_all_user_datasets(current_user: User) -> dict:
             # Delete S3 file
             if s3_key:
                 try:
-                    s3_manager.delete_file(s3_key)
+                    await asyncio.to_thread(s3_manager.delete_file, s3_key)
                     logger.info(f"Deleted S3 file: {s3_key}")
                 except Exception as e:
                     logger.error(f"Error deleting S3 file {s3_key}: {str(e)}")
@@ -346,7 +352,7 @@ async def get_dataset_anomalies(
         query["anomaly_score"] = {"$gte": min_score}
 
     cursor = anomalies_collection.find(query).sort("anomaly_score", -1)
-    anomalies = [DetectedAnomaly.model_validate(doc) for doc in cursor]
+    anomalies = DetectedAnomalyList.validate_python(list(cursor))
 
     return anomalies
 
@@ -589,7 +595,7 @@ async def get_analysis_session(session_id: str, current_user: User) -> AnalysisS
     if not session_doc:
         raise HTTPException(status_code=404, detail="Analysis session not found")
 
-    return AnalysisSession.model_validate(session_doc)
+    return AnalysisSession.from_mongo(session_doc)
 
 
 async def get_session_by_dataset(dataset_id: str, current_user: User) -> Optional[AnalysisSession]:
@@ -601,7 +607,7 @@ async def get_session_by_dataset(dataset_id: str, current_user: User) -> Optiona
     if not session_doc:
         return None
 
-    return AnalysisSession.model_validate(session_doc)
+    return AnalysisSession.from_mongo(session_doc)
 
 
 async def update_session_progress(
@@ -642,7 +648,7 @@ async def update_session_progress(
     )
 
     updated_doc = analysis_sessions_collection.find_one({"_id": ObjectId(session_id)})
-    return AnalysisSession.model_validate(updated_doc)
+    return AnalysisSession.from_mongo(updated_doc)
 
 
 # ============================================================================
@@ -764,7 +770,7 @@ async def get_llm_explanations_by_dataset(
         query["severity"] = severity
 
     cursor = llm_explanations_collection.find(query).sort("created_at", -1).limit(limit)
-    explanations = [LLMExplanation.model_validate(doc) for doc in cursor]
+    explanations = LLMExplanationList.validate_python(list(cursor))
 
     return explanations
 
@@ -8,6 +8,7 @@ from app.core.auth import (
     authenticate_user,
     create_access_token,
     get_password_hash,
+    invalidate_user,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from bson import ObjectId
@@ -20,14 +21,14 @@ logger = logging.getLogger(__name__)
 # User registration
 def create_user(user: UserCreate, is_mass_create: bool = False) -> User:
     # Check if user already exists
-    existing_user = users_collection.find_one({"email": user.email})
+    existing_user = users_collection.find_one({"email": user.email}, projection={"_id": 1})
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    existing_username = users_collection.find_one({"username": user.username})
+    existing_username = users_collection.find_one({"username_lower": user.username.lower()}, projection={"_id": 1})
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -46,6 +47,7 @@ def create_user(user: UserCreate, is_mass_create: bool = False) -> User:
     )
     
     new_user_data = user_in_db.model_dump(by_alias=True, exclude_none=True)
+    new_user_data["username_lower"] = user.username.lower()
     result = users_collection.insert_one(new_user_data)
     created_user_dict = users_collection.find_one({"_id": result.inserted_id})
     return User(**created_user_dict)
@@ -113,6 +115,7 @@ def update_user(user_id: str, user_data: dict):
             {"_id": ObjectId(user_id)},
             {"$set": update_payload}
         )
+        invalidate_user(user_id)
         
         if result.matched_count == 0:
             raise HTTPException(
@@ -173,6 +176,8 @@ async def delete_user(user_id_to_delete: str, current_admin_id: str):
                 print(f"Transaction aborted: {e}")
                 raise HTTPException(status_code=500, detail=f"Failed to delete user and associated data: {e}")
 
+    invalidate_user(user_id_to_delete)
+
     return {"detail": "User and all associated data deleted successfully"}
 
 def mass_create_users(emails: List[str], template_ids: List[str], current_admin_id: str) -> List[List[str]]:
@@ -253,6 +258,7 @@ def update_user_password(user_id: str,new_password: str, confirm_password: str):
             {"_id": ObjectId(user_id)},
             {"$set": {"hashed_password": new_hashed_password, "is_first_login": False}}
         )
+        invalidate_user(user_id)
         
         if result.modified_count == 0:
             logger.error(f"Failed to update password for user: {user_id}")
@@ -281,9 +287,9 @@ def update_user_username(user_id: str, new_username: str):
     try:
         # Check if the new username is already taken by another user
         existing_username = users_collection.find_one({
-            "username": new_username,
+            "username_lower": new_username.lower(),
             "_id": {"$ne": ObjectId(user_id)}  # Exclude current user
-        })
+        }, projection={"_id": 1})
         
         if existing_username:
             logger.warning(f"Username already taken: {new_username}")
@@ -304,8 +310,9 @@ def update_user_username(user_id: str, new_username: str):
         # Update the username and clear is_first_login if set.
         result = users_collection.update_one(
             {"_id": ObjectId(user_id)},
-            {"$set": {"username": new_username, "is_first_login": False}}
+            {"$set": {"username": new_username, "username_lower": new_username.lower(), "is_first_login": False}}
         )
+        invalidate_user(user_id)
         
         if result.modified_count == 0:
             logger.error(f"Failed to update username for user: {user_id}")
@@ -228,7 +228,7 @@ async def start_analysis(
         existing = analysis_sessions_collection.find_one({
             "dataset_id": dataset_id,
             "status": {"$in": ["initializing", "parsing", "detecting"]}
-        })
+        }, projection={"_id": 1})
 
         if existing:
             logger.info(f"Reusing existing session {existing['_id']} for dataset {dataset_id}")
@@ -250,7 +250,7 @@ async def start_analysis(
             existing = analysis_sessions_collection.find_one({
                 "dataset_id": dataset_id,
                 "status": {"$in": ["initializing", "parsing", "detecting"]}
-            })
+            }, projection={"_id": 1})
             if existing:
                 return {"session_id": str(existing["_id"]), "reused": True}
             raise HTTPException(status_code=409, detail="Session conflict")
@@ -320,7 +320,8 @@ async def run_autoencoder_background(dataset_id: str, user_id: str):
 
         # Download file from S3 and save locally
         logger.info(f"Downloading dataset {dataset_id} from S3: {dataset_doc['s3_key']}")
-        file_content = s3_manager.get_object_stream(dataset_doc['s3_key']).read()
+        # boto3 and the model run are blocking; keep them off the event loop so the API stays responsive
+        file_content = await asyncio.to_thread(s3_manager.get_object, dataset_doc['s3_key'])
 
         # Save to temp directory
         temp_dir = tempfile.gettempdir()
@@ -369,7 +370,8 @@ async def run_autoencoder_background(dataset_id: str, user_id: str):
 
         # Run AutoEncodeFinal analysis
         logger.info("Running AutoEncodeFinal anomaly detection...")
-        results = run_anomaly_detection(
+        results = await asyncio.to_thread(
+            run_anomaly_detection,
             dataset_path=dataset_path,
             model_dir=str(model_dir),
             output_dir=output_dir
@@ -896,7 +898,7 @@ async def start_llm_triage_analysis(
     import subprocess
     import tempfile
     import os
-    import json
+    import orjson
     from pathlib import Path
 
     try:
@@ -964,7 +966,10 @@ async def start_llm_triage_analysis(
         env["INPUT_CSV"] = csv_path
         env["OUTPUT_JSONL"] = output_jsonl
 
-        result = subprocess.run(
+        # Run in a worker thread so the event loop keeps serving other requests
+        # while the LLM script runs (up to the 10 minute timeout)
+        result = await asyncio.to_thread(
+            subprocess.run,
             ["python", str(gpt5_script)],
             env=env,
             capture_output=True,
@@ -993,10 +998,10 @@ async def start_llm_triage_analysis(
         else:
             logger.info(f"Reading and storing explanations from: {output_jsonl}")
 
-            with open(output_jsonl, 'r', encoding='utf-8') as f:
+            with open(output_jsonl, 'rb') as f:
                 for line_num, line in enumerate(f, 1):
                     try:
-                        explanation_data = json.loads(line)
+                        explanation_data = orjson.loads(line)
                         explanations_count += 1
 
                         # Enrich explanation with dataset_id and session context
@@ -1019,7 +1024,7 @@ async def start_llm_triage_analysis(
                         stored_count += 1
                         logger.debug(f"Stored explanation {line_num} with ID: {inserted_id}")
 
-                    except json.JSONDecodeError as e:
+                    except orjson.JSONDecodeError as e:
                         logger.error(f"Failed to parse JSONL line {line_num}: {e}")
                     except Exception as e:
                         logger.error(f"Failed to store explanation {line_num} in database: {e}", exc_info=True)
@@ -0,0 +1,51 @@
+# app/settings.py
+"""
+Process-wide configuration, read from the environment (and .env) once at import.
+"""
+
+from functools import cached_property
+from typing import Optional
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+load_dotenv()
+
+
+class Settings(BaseSettings):
+    """Environment-backed settings; field names map to the upper-case env vars"""
+    model_config = SettingsConfigDict(extra="ignore")
+
+    app_env: str = "development"
+    project_variant: Optional[str] = None
+
+    # MongoDB
+    mongo_sof_db_uri: Optional[str] = None
+    mongo_case_and_custom_db_uri: Optional[str] = None
+    mongo_max_pool: int = 200
+    mongo_min_pool: int = 10
+
+    # Root path the backend is served under, per project variant
+    sof_url: str = ""
+    report_url: str = ""
+    custom_url: str = ""
+
+    @cached_property
+    def mongo_uri(self) -> Optional[str]:
+        if self.app_env == "production":
+            return self.mongo_sof_db_uri if self.project_variant == "sof" else self.mongo_case_and_custom_db_uri
+        # Local MongoDB connection (Docker)
+        return "mongodb://mongodb:27017/?directConnection=true"
+
+    @cached_property
+    def root_url_backend(self) -> str:
+        if self.project_variant == "sof":
+            return self.sof_url
+        if self.project_variant == "report":
+            return self.report_url
+        if self.project_variant == "custom":
+            return self.custom_url
+        return ""
+
+
+settings = Settings()
@@ -5,12 +5,13 @@ Uses Azure OpenAI GPT-5-mini to analyze detected anomalies and generate security
 
 import os
 import json
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import pandas as pd
 
-from openai import AzureOpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -24,18 +25,53 @@ DEPLOYMENT = os.environ.get("AZURE_OPENAI_DEPLOYMENT")
 API_VERSION = os.environ.get("AZURE_OPENAI_API_VERSION")
 
 # Check if Azure OpenAI is configured
-AZURE_CONFIGURED = all([ENDPOINT, API_KEY, DEPLOYMENT, API_VERSION])
-
-if AZURE_CONFIGURED:
-    client = AzureOpenAI(
-        api_version=API_VERSION,
-        azure_endpoint=ENDPOINT,
-        api_key=API_KEY,
+_REQUIRED_ENV = frozenset({
+    "AZURE_OPENAI_ENDPOINT",
+    "AZURE_OPENAI_API_KEY",
+    "AZURE_OPENAI_DEPLOYMENT",
+    "AZURE_OPENAI_API_VERSION",
+})
+_missing_env = _REQUIRED_ENV - {k for k, v in os.environ.items() if v}
+AZURE_CONFIGURED = not _missing_env
+
+if not AZURE_CONFIGURED:
+    logger.warning(
+        "Azure OpenAI not configured (missing %s). LLM triage will not be available.",
+        ", ".join(sorted(_missing_env)),
     )
-    logger.info("Azure OpenAI client initialized successfully")
-else:
-    client = None
-    logger.warning("Azure OpenAI not configured. LLM triage will not be available.")
+
+# Clients are created on first use so importing this module doesn't pull in the openai SDK.
+# One client (and its pooled HTTP connections) is kept per endpoint/version/key.
+_clients: Dict[Tuple[str, str, str], Any] = {}
+
+
+def get_client(endpoint: Optional[str] = None, api_version: Optional[str] = None, api_key: Optional[str] = None):
+    """Get a shared Azure OpenAI client for the given (or configured) credentials"""
+    endpoint = endpoint or ENDPOINT
+    api_version = api_version or API_VERSION
+    api_key = api_key or API_KEY
+    if not all([endpoint, api_version, api_key]):
+        return None
+
+    cache_key = (endpoint, api_version, hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+    client = _clients.get(cache_key)
+    if client is None:
+        from openai import AzureOpenAI
+
+        client = _clients[cache_key] = AzureOpenAI(
+            api_version=api_version,
+            azure_endpoint=endpoint,
+            api_key=api_key,
+        )
+        logger.info("Azure OpenAI client initialized successfully")
+    return client
+
+
+def __getattr__(name):
+    # Keep `llm_triage.client` working for callers that read the attribute directly
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 SYSTEM_PROMPT = """
@@ -127,6 +163,9 @@ Rules:
 - Output exactly ONE JSON object per request.
 """
 
+# The system turn never changes, so build its message once and reuse it for every call
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
 
 def summarize_anomaly_row(row_data: Dict[str, Any]) -> str:
     """
@@ -227,6 +266,7 @@ def analyze_anomaly_with_llm(
         ValueError: If Azure OpenAI is not configured
         Exception: If LLM call fails
     """
+    client = get_client()
     if not AZURE_CONFIGURED or client is None:
         raise ValueError(
             "Azure OpenAI is not configured. Please set AZURE_OPENAI_ENDPOINT, "
@@ -253,7 +293,7 @@ Return ONLY the JSON object as specified. No extra text.
         resp = client.chat.completions.create(
             model=DEPLOYMENT,
             messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
+                SYSTEM_MESSAGE,
                 {"role": "user", "content": user_content},
             ],
             temperature=0.2,
@@ -340,7 +380,8 @@ def batch_analyze_anomalies(
     anomalies: list[Dict[str, Any]],
     dataset_id: str,
     session_id: Optional[str] = None,
-    max_anomalies: Optional[int] = None
+    max_anomalies: Optional[int] = None,
+    max_workers: int = 8
 ) -> list[Dict[str, Any]]:
     """
     Analyze multiple anomalies in batch.
@@ -350,6 +391,7 @@ def batch_analyze_anomalies(
         dataset_id: ID of the dataset
         session_id: Optional analysis session ID
         max_anomalies: Optional limit on number of anomalies to process
+        max_workers: Number of LLM requests to keep in flight concurrently
 
     Returns:
         List of LLM analysis dictionaries
@@ -360,25 +402,32 @@ def batch_analyze_anomalies(
     if max_anomalies:
         anomalies = anomalies[:max_anomalies]
 
-    results = []
-
-    for i, anomaly in enumerate(anomalies, start=1):
+    def analyze(i: int, anomaly: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
             anomaly_id = str(anomaly.get("_id", f"anomaly_{i}"))
-            analysis = analyze_anomaly_with_llm(
+            return analyze_anomaly_with_llm(
                 anomaly_data=anomaly,
                 dataset_id=dataset_id,
                 anomaly_id=anomaly_id,
                 session_id=session_id
             )
-            results.append(analysis)
-
-            if i % 10 == 0:
-                logger.info(f"Processed {i}/{len(anomalies)} anomalies")
-
         except Exception as e:
             logger.error(f"Failed to analyze anomaly {i}: {str(e)}")
             # Continue with next anomaly
+            return None
+
+    results = []
+
+    # LLM calls are network-bound; run several at once and keep the input order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(analyze, i, anomaly) for i, anomaly in enumerate(anomalies, start=1)]
+        for i, future in enumerate(futures, start=1):
+            analysis = future.result()
+            if analysis is not None:
+                results.append(analysis)
+
+            if i % 10 == 0:
+                logger.info(f"Processed {i}/{len(anomalies)} anomalies")
 
     logger.info(f"Completed batch analysis: {len(results)}/{len(anomalies)} anomalies processed")
     return results
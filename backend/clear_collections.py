@@ -62,9 +62,10 @@ def clear_database():
     print("\n✓ All collections cleared!")
     print("\nRecreating indexes...")
 
-    # Import and run create_indexes
-    from app.database.connection import create_indexes
+    # Import and run create_indexes (plus the dev admin, which the clear removed)
+    from app.database.connection import create_indexes, ensure_dev_admin
     create_indexes()
+    ensure_dev_admin()
 
     print("\n✓ Database is now clean and ready to use.")
     client.close()
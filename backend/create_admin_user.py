@@ -24,6 +24,7 @@ def create_admin_user():
     admin_user = {
         "email": "admin@example.com",
         "username": "admin",
+        "username_lower": "admin",
         "disabled": False,
         "hashed_password": get_password_hash("password123"),
         "is_admin": True
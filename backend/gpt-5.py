@@ -1,10 +1,13 @@
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import orjson
 import pandas as pd
 from dotenv import load_dotenv
-from openai import AzureOpenAI
+
+from app.utils.llm_triage import SYSTEM_MESSAGE, extract_text_from_message, get_client
 
 load_dotenv()
 
@@ -13,107 +16,13 @@ API_KEY = os.environ["AZURE_OPENAI_API_KEY"]
 DEPLOYMENT = os.environ["AZURE_OPENAI_DEPLOYMENT"]
 API_VERSION = os.environ["AZURE_OPENAI_API_VERSION"]
 
-client = AzureOpenAI(
-    api_version=API_VERSION,
-    azure_endpoint=ENDPOINT,
-    api_key=API_KEY,
-)
+client = get_client(ENDPOINT, API_VERSION, API_KEY)
 
 # Read from environment variables (set by API endpoint) or use defaults
 INPUT_CSV = os.environ.get("INPUT_CSV", "BETH_anomaly.csv")  # your anomalies file (TSV or CSV)
 OUTPUT_JSONL = os.environ.get("OUTPUT_JSONL", "BETH_llm_explanations.jsonl")  # only JSON explanations
 MAX_ROWS = 200                                # safety limit
-
-
-SYSTEM_PROMPT = """
-You are a senior SOC analyst and assistant for an automated anomaly triage pipeline.
-
-You receive:
-- A single security anomaly event derived from the BETH dataset or similar telemetry.
-- Minimal metadata: dataset_id, anomaly_id, session_id, row_index, timestamps, and model scores.
-
-Your task:
-Return ONE JSON object that conforms EXACTLY to the following schema:
-
-{
-  "schema_version": "1.0",
-  "dataset_id": "<string>",
-  "anomaly_id": "<string>",
-  "session_id": "<string or null>",
-  "verdict": "suspicious" | "likely_malicious" | "unclear",
-  "severity": "low" | "medium" | "high" | "critical",
-  "confidence_label": "low" | "medium" | "high",
-  "confidence_score": <float between 0 and 1>,
-  "mitre": [
-    {"id": "<TACTIC/TECHNIQUE ID>", "name": "<name>", "confidence": <0-1>, "rationale": "<optional string>"}
-  ],
-  "actors": {
-    "user_id": "<string or null>",
-    "username": "<string or null>",
-    "process_name": "<string or null>",
-    "pid": <int or null>,
-    "ppid": <int or null>
-  },
-  "host": {
-    "hostname": "<string or null>",
-    "mount_ns": "<string or null>"
-  },
-  "event": {
-    "name": "<eventName or similar>",
-    "timestamp": "<ISO-8601 or null>",
-    "args": [
-      {"name": "<arg_name>", "type": "<arg_type>", "value": "<stringified_value>"}
-    ]
-  },
-  "features": [
-    {"name": "<feature_name>", "value": <float>, "z": <float or null>}
-  ],
-  "evidence_refs": [
-    {
-      "type": "row",
-      "row_index": <int or null>,
-      "sheet": "<string or null>",
-      "s3_key": "<string or null>"
-    }
-  ],
-  "key_indicators": [
-    "<short bullet referencing specific fields and why they are suspicious>"
-  ],
-  "triage": {
-    "immediate_actions": ["<short actionable step>", "..."],
-    "short_term": ["<playbook / follow-up>", "..."],
-    "long_term": ["<hardening / strategic>", "..."]
-  },
-  "notes": "<2-4 sentences summarizing reasoning and uncertainties>",
-  "status": "new",
-  "owner": null,
-  "provenance": {
-    "model_name": "gpt-5-mini",
-    "model_version": "base",
-    "prompt_id": "beth-triage-v1",
-    "temperature": 0.2,
-    "tokens_prompt": null,
-    "tokens_output": null,
-    "latency_ms": null
-  },
-  "_created_at": "<ISO-8601 UTC timestamp for when this explanation is generated>",
-  "hash": null
-}
-
-Rules:
-- Use ONLY valid JSON. No comments, no trailing commas, no markdown.
-- Fill fields using ONLY provided event data and reasonable security judgement.
-- Do NOT fabricate usernames or paths that conflict with given data.
-- If a field cannot be inferred, set it to null or a safe default (e.g. [], null).
-- "mitre" entries must be plausible and tied to evidence in key_indicators/notes.
-- "severity" should reflect potential impact given the event context and verdict.
-- "confidence_score" must be consistent with "confidence_label".
-- "key_indicators" must reference concrete fields (e.g. processName, args, userId).
-- "triage" actions must be defensive and realistic.
-- Do NOT include exploit instructions or offensive guidance.
-- Output exactly ONE JSON object per request.
-"""
-
+LLM_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", "8"))  # parallel LLM requests
 
 
 def load_beth_csv(path: str) -> pd.DataFrame:
@@ -167,28 +76,6 @@ def summarize_beth_row(row: pd.Series) -> str:
     return ", ".join(parts)
 
 
-def extract_text_from_message(message) -> str:
-    """Handle both string and list-style message.content formats."""
-    content = message.content
-
-    if isinstance(content, list):
-        pieces = []
-        for c in content:
-            text = getattr(c, "text", None)
-            if text is None and isinstance(c, dict):
-                text = c.get("text")
-            if hasattr(text, "value"):
-                text = text.value
-            if text:
-                pieces.append(str(text))
-        return "".join(pieces).strip()
-
-    if content is not None:
-        return str(content).strip()
-
-    return ""
-
-
 def explain_beth_anomaly(row: pd.Series) -> dict:
     """
     Call GPT-5-mini to explain an anomaly.
@@ -207,7 +94,7 @@ Return ONLY the JSON object as specified. No extra text.
     resp = client.chat.completions.create(
         model=DEPLOYMENT,
         messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
+            SYSTEM_MESSAGE,
             {"role": "user", "content": user_content},
         ],
     )
@@ -234,6 +121,21 @@ Return ONLY the JSON object as specified. No extra text.
         }
 
 
+def explain_or_error(row: pd.Series) -> dict:
+    """Explain one anomaly, turning LLM errors into an 'unclear' record."""
+    try:
+        return explain_beth_anomaly(row)
+    except Exception as e:
+        return {
+            "verdict": "unclear",
+            "confidence": "low",
+            "mitre_techniques": [],
+            "key_indicators": [],
+            "notes": f"Error calling LLM: {e}",
+            "_llm_timestamp_utc": datetime.now().astimezone().isoformat(),
+        }
+
+
 def select_anomalies(df: pd.DataFrame) -> pd.DataFrame:
     """
     Decide which rows to treat as anomalies.
@@ -274,22 +176,14 @@ def main():
 
     print(f"[INFO] Explaining {len(anomalies)} anomalies with LLM...")
 
-    with open(OUTPUT_JSONL, "w", encoding="utf-8") as f_out:
-        for i, (_, row) in enumerate(anomalies.iterrows(), start=1):
-            try:
-                explanation = explain_beth_anomaly(row)
-            except Exception as e:
-                explanation = {
-                    "verdict": "unclear",
-                    "confidence": "low",
-                    "mitre_techniques": [],
-                    "key_indicators": [],
-                    "notes": f"Error calling LLM: {e}",
-                    "_llm_timestamp_utc": datetime.now().astimezone().isoformat(),
-                }
-
-            # Write one JSON object per line
-            f_out.write(json.dumps(explanation, ensure_ascii=False) + "\n")
+    # Each call is network-bound, so keep several requests in flight.
+    # map() yields results in input order, so the JSONL lines still follow the CSV rows.
+    rows = (row for _, row in anomalies.iterrows())
+    with ThreadPoolExecutor(max_workers=LLM_CONCURRENCY) as executor, \
+            open(OUTPUT_JSONL, "wb") as f_out:
+        for i, explanation in enumerate(executor.map(explain_or_error, rows), start=1):
+            # Write one JSON object per line (orjson emits UTF-8 bytes directly)
+            f_out.write(orjson.dumps(explanation) + b"\n")
 
             if i % 10 == 0:
                 print(f"[INFO] Processed {i} anomalies...")
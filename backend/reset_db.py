@@ -14,7 +14,7 @@ load_dotenv('.env.local')
 original_env = os.getenv('APP_ENV')
 os.environ['APP_ENV'] = 'development'
 
-from app.database.connection import reset_database, create_indexes
+from app.database.connection import reset_database, create_indexes, ensure_dev_admin
 
 def main():
     print("=" * 60)
@@ -38,6 +38,7 @@ def main():
         print("\n✓ Database reset successful!")
         print("\nRecreating indexes...")
         create_indexes()
+        ensure_dev_admin()
         print("\n✓ Indexes recreated successfully!")
         print("\nDatabase is now clean and ready to use.")
     else:
@@ -1,12 +1,25 @@
 import pandas as pd
 import numpy as np
 import sys
+from functools import lru_cache
 from pathlib import Path
 from tensorflow import keras
 from data_preprocessing import SequencePreprocessor
 from sklearn.metrics import confusion_matrix, precision_score, recall_score, f1_score
 
 
+@lru_cache(maxsize=4)
+def _load_model(model_path):
+    """Load the autoencoder once per process; later runs reuse the same weights."""
+    return keras.models.load_model(model_path, compile=False)
+
+
+@lru_cache(maxsize=4)
+def _load_preprocessor(preprocessor_path):
+    """Load the fitted SequencePreprocessor once per process."""
+    return SequencePreprocessor.load(preprocessor_path)
+
+
 def run_anomaly_detection(dataset_path, model_dir='../../Model/AutoEncoder', output_dir='.'):
     """
     Run autoencoder anomaly detection on a dataset.
@@ -25,8 +38,8 @@ def run_anomaly_detection(dataset_path, model_dir='../../Model/AutoEncoder', out
 
     # 1. Load the trained model and preprocessor
     print("Loading model...")
-    model = keras.models.load_model(str(model_dir / 'Final.h5'), compile=False)
-    preprocessor = SequencePreprocessor.load(str(model_dir / 'preprocessor.pkl'))
+    model = _load_model(str(model_dir / 'Final.h5'))
+    preprocessor = _load_preprocessor(str(model_dir / 'preprocessor.pkl'))
     threshold = 2.62
 
     print(f"Anomaly threshold: {threshold:.6f}")
@@ -133,20 +146,14 @@ def run_anomaly_detection(dataset_path, model_dir='../../Model/AutoEncoder', out
         anomaly_errors = reconstruction_errors[anomaly_indices]
 
         # Calculate priority quartiles
-        q75 = np.percentile(anomaly_errors, 75)
-        q50 = np.percentile(anomaly_errors, 50)
-        q25 = np.percentile(anomaly_errors, 25)
-
-        priorities = []
-        for error in anomaly_errors:
-            if error >= q75:
-                priorities.append('CRITICAL')
-            elif error >= q50:
-                priorities.append('HIGH')
-            elif error >= q25:
-                priorities.append('MEDIUM')
-            else:
-                priorities.append('LOW')
+        q75, q50, q25 = np.percentile(anomaly_errors, [75, 50, 25])
+
+        # Bucket every anomaly in one vectorized pass (first matching condition wins)
+        priorities = np.select(
+            [anomaly_errors >= q75, anomaly_errors >= q50, anomaly_errors >= q25],
+            ['CRITICAL', 'HIGH', 'MEDIUM'],
+            default='LOW',
+        ).tolist()
 
         # 7. Create results DataFrame with additional context
         # Extract ALL columns from original data for each anomaly
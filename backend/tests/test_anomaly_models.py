@@ -0,0 +1,49 @@
+from bson import ObjectId
+
+from app.models.anomaly_models import DetectedAnomalyList, LLMExplanationList, validate_object_id
+
+
+def test_validate_object_id_keeps_objectid_value():
+    oid = ObjectId()
+    assert validate_object_id(oid) == str(oid)
+
+
+def test_detected_anomaly_list_round_trips_mongo_id():
+    oid = ObjectId()
+    doc = {
+        "_id": oid,
+        "dataset_id": str(ObjectId()),
+        "user_id": str(ObjectId()),
+        "anomaly_score": 0.5,
+        "row_index": 1,
+        "sheet_name": "Sheet1",
+        "raw_data": {},
+    }
+
+    [anomaly] = DetectedAnomalyList.validate_python([doc])
+
+    assert anomaly.id == str(oid)
+    assert anomaly.dataset_id == doc["dataset_id"]
+
+
+def test_llm_explanation_list_round_trips_mongo_id():
+    oid = ObjectId()
+    doc = {
+        "_id": oid,
+        "dataset_id": str(ObjectId()),
+        "anomaly_id": str(ObjectId()),
+        "verdict": "suspicious",
+        "severity": "high",
+        "confidence_label": "medium",
+        "confidence_score": 0.6,
+        "actors": {},
+        "host": {},
+        "event": {"name": "close"},
+        "triage": {},
+        "notes": "",
+        "provenance": {},
+    }
+
+    [explanation] = LLMExplanationList.validate_python([doc])
+
+    assert explanation.id == str(oid)
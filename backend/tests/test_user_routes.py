@@ -0,0 +1,55 @@
+from unittest import mock
+
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+from app.core import auth
+from app.main import app
+
+
+def test_read_users_me_serializes_mongo_id():
+    oid = ObjectId()
+    user_doc = {
+        "_id": oid,
+        "email": "user@example.com",
+        "username": "user",
+        "disabled": False,
+        "is_admin": False,
+        "is_first_login": False,
+        "hashed_password": "not-used",
+    }
+    token = auth.create_access_token({"user_id": str(oid)})
+
+    with mock.patch.object(auth.users_collection, "find_one", return_value=user_doc):
+        auth.invalidate_user(str(oid))
+        response = TestClient(app).get(
+            "/api/auth/users/me", headers={"Authorization": f"Bearer {token}"}
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["_id"] == str(oid)
+    assert body["username"] == "user"
+    assert "hashed_password" not in body
+
+
+def test_get_user_by_id_normalizes_mongo_id():
+    oid = ObjectId()
+    user_doc = {"_id": oid, "email": "user@example.com", "username": "user", "hashed_password": "x"}
+
+    with mock.patch.object(auth.users_collection, "find_one", return_value=user_doc):
+        auth.invalidate_user(str(oid))
+        user = auth.get_user_by_id(str(oid))
+
+    assert user.id == str(oid)
+    assert user.is_admin is False
+
+
+def test_get_user_matches_lowercased_username():
+    user_doc = {"_id": ObjectId(), "email": "user@example.com", "username": "User", "hashed_password": "x"}
+
+    with mock.patch.object(auth.users_collection, "find_one", return_value=user_doc) as find_one:
+        user = auth.get_user("USER")
+
+    assert find_one.call_args.args[0] == {"username_lower": "user"}
+    assert user.username == "User"